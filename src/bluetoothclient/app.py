@@ -8,9 +8,52 @@ import toga
 from toga.style import Pack
 from toga.style.pack import COLUMN, ROW
 
+from bluetoothclient.resources import DEVICE_DATA
 from bluetoothclient.resources.esp_ouis import ouis as esp_ouis
 from bluetoothclient.bluetooth_manager import BluetoothManager
 
+# 共享的组件样式, toga 创建组件时会复制样式, 共用同一实例是安全的
+_BUTTON_STYLE = Pack(padding=5)
+_LABEL_STYLE_8 = Pack(padding=(8, 5))
+_LABEL_STYLE_7 = Pack(padding=(7, 5))
+_ROW_STYLE = Pack(direction=ROW)
+_TABLE_STYLE = Pack(width=280)
+# 提前结束的扫描连续多少次未发现某设备后将其移出表格
+_SCAN_MISS_LIMIT = 2
+
+
+def _add_device_row(data, rows: dict, device: dict) -> None:
+    """按 MAC 去重, 新设备追加到表格"""
+    if device["mac"] not in rows:
+        rows[device["mac"]] = data.append(device)
+
+
+def _apply_scan_results(
+    data, rows: dict, misses: dict, matched: list[dict], complete: bool = True
+) -> None:
+    """按 MAC 增量更新设备表格, 未变化的行保持不动
+
+    完整扫描中未出现的设备直接移除; 提前结束的扫描可能漏掉仍在附近的设备,
+    连续 _SCAN_MISS_LIMIT 次未出现才移除
+    """
+    seen = set()
+    for device in matched:
+        mac = device["mac"]
+        seen.add(mac)
+        misses.pop(mac, None)
+        row = rows.get(mac)
+        if row is None:
+            rows[mac] = data.append(device)
+        elif row.name != device["name"]:
+            row.name = device["name"]
+    for mac in rows.keys() - seen:
+        count = misses.get(mac, 0) + 1
+        if complete or count >= _SCAN_MISS_LIMIT:
+            misses.pop(mac, None)
+            data.remove(rows.pop(mac))
+        else:
+            misses[mac] = count
+
 
 def setup_logging() -> None:
     """配置日志系统"""
@@ -37,9 +80,8 @@ class BluetoothClient(toga.App):
         self.target_name: str = bluetooth_data["bluetooth_info"]["target_name"]
         self.esp_ouis: set[str] = esp_ouis
         self.bluetooth_manager = BluetoothManager(
-            self.service_uuid, self.char_uuid, self.target_name, self.esp_ouis, self.update_status_callback
+            self.service_uuid, self.char_uuid, self.target_name, self.esp_ouis, self._update_status
         )
-        self.event_loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
 
         # UI组件声明
         self.device_list: list[toga.Box] = list()
@@ -49,15 +91,29 @@ class BluetoothClient(toga.App):
         self.connect_button: toga.Button | None = None
         self.disconnect_button: toga.Button | None = None
         self.device_table: toga.Table | None = None
+        self._device_rows: dict = dict()
+        self._device_misses: dict[str, int] = dict()
+        self._control_commands: dict[toga.Button, int] = dict()
         self.device_status: toga.Box | None = None
         self.split: toga.SplitContainer | None = None
         self.status_table: toga.Table | None = None
+        self._status_row = None
         
         self.logger = logging.getLogger(self.__class__.__name__)      
         setup_logging()
 
+    @property
+    def event_loop(self) -> asyncio.AbstractEventLoop:
+        """应用主线程的事件循环, 由 toga 创建"""
+        return self.loop
+
     def startup(self) -> None:
         """初始化用户界面"""
+        # 任务立即执行到第一次挂起 (Python 3.12+)
+        eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+        if eager_task_factory is not None:
+            self.event_loop.set_task_factory(eager_task_factory)
+
         # 初始化主容器
         self.split = toga.SplitContainer()
 
@@ -89,7 +145,7 @@ class BluetoothClient(toga.App):
 
         # 扫描按钮
         self.scan_button = toga.Button(
-            "蓝牙扫描", style=Pack(padding=5), on_press=self.scan_bluetooth
+            "蓝牙扫描", style=_BUTTON_STYLE, on_press=self.scan_bluetooth
         )
 
         # 设备表格
@@ -97,17 +153,17 @@ class BluetoothClient(toga.App):
             headings=["名称", "MAC"],
             data=[],
             accessors=["name", "mac"],
-            style=Pack(width=280),
+            style=_TABLE_STYLE,
         )
 
         # 连接按钮
         self.connect_button = toga.Button(
-            "蓝牙连接", style=Pack(padding=5), on_press=self.connect_bluetooth
+            "蓝牙连接", style=_BUTTON_STYLE, on_press=self.connect_bluetooth
         )
 
         # 断开按钮
         self.disconnect_button = toga.Button(
-            "蓝牙断开", style=Pack(padding=5), on_press=self.disconnect_bluetooth
+            "蓝牙断开", style=_BUTTON_STYLE, on_press=self.disconnect_bluetooth
         )
 
         # 添加组件到左侧面板
@@ -133,15 +189,10 @@ class BluetoothClient(toga.App):
 
     def _create_control_panels(self) -> None:
         """创建设备控制面板"""
-
-        resource_path = files("bluetoothclient.resources") / "device.json"
-        with resource_path.open(encoding="utf-8") as file:
-            device_data = json.load(file)
-
-        for device in device_data:
-            self.device_list.append(toga.Box(style=Pack(direction=ROW)))
+        for device in DEVICE_DATA:
+            self.device_list.append(toga.Box(style=_ROW_STYLE))
             self.device_list[-1].add(
-                toga.Label(device["device_name"], style=Pack(padding=(8, 5))),
+                toga.Label(device["device_name"], style=_LABEL_STYLE_8),
                 *self._create_control_buttons(
                     [button["command"] for button in device["buttons"]],
                     [button["option"] for button in device["buttons"]],
@@ -152,12 +203,14 @@ class BluetoothClient(toga.App):
         self, commands: list[int], labels: list[str]
     ) -> list[toga.Button]:
         """创建控制按钮组"""
-        return [
-            toga.Button(
-                label, style=Pack(padding=5), on_press=self.create_control_handler(cmd)
+        buttons = []
+        for cmd, label in zip(commands, labels):
+            button = toga.Button(
+                label, style=_BUTTON_STYLE, on_press=self._on_control_press
             )
-            for cmd, label in zip(commands, labels)
-        ]
+            self._control_commands[button] = cmd
+            buttons.append(button)
+        return buttons
 
     def _create_status_table(self) -> None:
         """创建设备状态表"""
@@ -165,80 +218,76 @@ class BluetoothClient(toga.App):
             headings=["灯光", "风扇", "电热器"],
             data=[{"light": "-", "fan": "-", "heater": "-"}],
             accessors=["light", "fan", "heater"],
-            style=Pack(width=280),
+            style=_TABLE_STYLE,
         )
+        self._status_row = self.status_table.data[0]
         self.device_status = toga.Box(style=Pack(direction=COLUMN))
         self.device_status.add(
-            toga.Label("设备状态", style=Pack(padding=(7, 5))), self.status_table
+            toga.Label("设备状态", style=_LABEL_STYLE_7), self.status_table
         )
 
-    def create_control_handler(self, command_value: int):
-        """生成控制按钮处理器"""
-
-        async def handler(widget: toga.Widget) -> None:
-            if await self.bluetooth_manager.send_command(command_value):
-                self.logger.info(f"发送控制命令: {command_value} 成功")
-            else:
-                await self.main_window.dialog(
-                    toga.ErrorDialog("错误", "设备未连接或发送失败")
-                )
-
-        return handler
+    async def _on_control_press(self, widget: toga.Widget) -> None:
+        """控制按钮处理器, 按按钮查找对应指令值"""
+        command_value = self._control_commands[widget]
+        if await self.bluetooth_manager.send_command(command_value):
+            self.logger.info("发送控制命令: %s 成功", command_value)
+        else:
+            await self.main_window.dialog(
+                toga.ErrorDialog("错误", "设备未连接或发送失败")
+            )
 
-    def scan_bluetooth(self, widget: toga.Widget) -> None:
+    async def scan_bluetooth(self, widget: toga.Widget) -> None:
         """执行蓝牙扫描"""
+        matched, complete = await self.bluetooth_manager.scan_devices(
+            on_found=self._add_scanned_device
+        )
 
-        async def start_scan() -> None:
-            matched = await self.bluetooth_manager.scan_devices()
-
-            if self.device_table:
-                self.device_table.data = matched
-
-            if not matched:
-                await self.main_window.dialog(toga.InfoDialog("提示", "未找到目标设备"))
+        if self.device_table:
+            _apply_scan_results(
+                self.device_table.data,
+                self._device_rows,
+                self._device_misses,
+                matched,
+                complete,
+            )
 
-        self.event_loop.create_task(start_scan())
+        if not matched:
+            await self.main_window.dialog(toga.InfoDialog("提示", "未找到目标设备"))
 
-    def connect_bluetooth(self, widget: toga.Widget) -> None:
+    async def connect_bluetooth(self, widget: toga.Widget) -> None:
         """连接设备"""
+        if not self.device_table or not self.device_table.selection:
+            await self.main_window.dialog(
+                toga.ErrorDialog("错误", "请先选择要连接的设备")
+            )
+            return
 
-        async def start_connect() -> None:
-            if not self.device_table or not self.device_table.selection:
-                await self.main_window.dialog(
-                    toga.ErrorDialog("错误", "请先选择要连接的设备")
-                )
-                return
-
-            address = self.device_table.selection.mac
-            if await self.bluetooth_manager.connect_to_device(address):
-                await self.main_window.dialog(toga.InfoDialog("连接状态", "连接成功"))
-            else:
-                await self.main_window.dialog(toga.ErrorDialog("错误", "连接失败"))
-
-        self.event_loop.create_task(start_connect())
+        address = self.device_table.selection.mac
+        if await self.bluetooth_manager.connect_to_device(address):
+            await self.main_window.dialog(toga.InfoDialog("连接状态", "连接成功"))
+        else:
+            await self.main_window.dialog(toga.ErrorDialog("错误", "连接失败"))
 
-    def disconnect_bluetooth(self, widget: toga.Widget) -> None:
+    async def disconnect_bluetooth(self, widget: toga.Widget) -> None:
         """断开连接"""
+        if await self.bluetooth_manager.disconnect():
+            await self.main_window.dialog(toga.InfoDialog("连接状态", "已断开连接"))
+            self._update_status("-", "-", "-")
+        else:
+            await self.main_window.dialog(toga.ErrorDialog("错误", "断开失败"))
 
-        async def start_disconnect() -> None:
-            if await self.bluetooth_manager.disconnect():
-                await self.main_window.dialog(toga.InfoDialog("连接状态", "已断开连接"))
-                self._update_status("-", "-", "-")
-            else:
-                await self.main_window.dialog(toga.ErrorDialog("错误", "断开失败"))
-
-        self.event_loop.create_task(start_disconnect())
+    def _add_scanned_device(self, device: dict) -> None:
+        """扫描过程中发现设备即加入表格"""
+        if self.device_table:
+            _add_device_row(self.device_table.data, self._device_rows, device)
 
     def _update_status(self, light: str, fan: str, heater: str) -> None:
         """更新状态显示"""
-        if self.status_table:
-            self.status_table.data.clear()
-            self.status_table.data.append(
-                {"light": light, "fan": fan, "heater": heater}
-            )
-
-    def update_status_callback(self, status):
-        self._update_status(status["light"], status["fan"], status["heater"])
+        row = self._status_row
+        if row is not None:
+            row.light = light
+            row.fan = fan
+            row.heater = heater
 
 
 def main() -> BluetoothClient:
@@ -1,9 +1,41 @@
 import asyncio
 import logging
-import json
-from importlib.resources import files
 from bleak import BleakClient, BleakError, BleakGATTCharacteristic, BleakScanner
-from re import sub
+from bleak.uuids import normalize_uuid_str
+
+# 设备状态码 -> 状态描述
+_STATUS_MAPPING: dict[str, dict[int, str]] = {
+    "light": {1: "低亮", 2: "关闭", 3: "中亮", 4: "高亮", 5: "呼吸", 6: "流水"},
+    "fan": {7: "低速", 8: "关闭", 9: "中速", 10: "高速"},
+    "heater": {15: "低温", 16: "关闭", 17: "中温", 18: "高温"},
+}
+# 扫描最长时间, 以及发现首个目标后继续收集的时间 (秒)
+_SCAN_TIMEOUT = 2.0
+_SCAN_SETTLE = 0.5
+# 单字节指令负载
+_BYTE_CACHE = tuple(bytes((i,)) for i in range(256))
+# MAC 地址中的分隔符
+_MAC_SEPARATORS = str.maketrans("", "", ":-. _")
+
+
+def _build_status_table(device: str) -> tuple[str, ...]:
+    """按原始字节值索引的状态描述表"""
+    table = ["未知"] * 256
+    for value, text in _STATUS_MAPPING[device].items():
+        table[value] = text
+    return tuple(table)
+
+
+_LIGHT_STATUS = _build_status_table("light")
+_FAN_STATUS = _build_status_table("fan")
+_HEATER_STATUS = _build_status_table("heater")
+# 三字节状态包 (大端整数) -> (灯光, 风扇, 电热器), 仅含已知状态组合
+_PACKED_STATUS: dict[int, tuple[str, str, str]] = {
+    (light << 16) | (fan << 8) | heater: (light_text, fan_text, heater_text)
+    for light, light_text in _STATUS_MAPPING["light"].items()
+    for fan, fan_text in _STATUS_MAPPING["fan"].items()
+    for heater, heater_text in _STATUS_MAPPING["heater"].items()
+}
 
 
 class BluetoothManager:
@@ -12,84 +44,128 @@ class BluetoothManager:
         self.service_uuid = service_uuid
         self.char_uuid = char_uuid
         self.logger = logging.getLogger(self.__class__.__name__)
+        # bleak 以小写带连字符的规范形式给出 UUID, 这里只规范化一次
+        self._service_uuid_lower = self._normalize_uuid(service_uuid)
+        self._char_uuid_lower = self._normalize_uuid(char_uuid)
         self.client = None
+        self._target_char: BleakGATTCharacteristic | None = None
+        self._supports_wnr = False
         self.target_name = target_name
-        self.esp_ouis = esp_ouis
-        self.event_loop = asyncio.get_event_loop()
+        self.esp_ouis = frozenset(int(oui, 16) for oui in esp_ouis)
         self.status_callback = status_callback
 
-    async def scan_devices(self):
+    def _normalize_uuid(self, uuid: str) -> str:
+        """转换为 128 位规范 UUID, 16/32 位短 UUID 会被展开"""
+        try:
+            return normalize_uuid_str(uuid)
+        except ValueError:
+            self.logger.error("无效的 UUID: %s", uuid)
+            return uuid.lower()
+
+    async def scan_devices(self, on_found=None):
+        """扫描目标设备, 发现首个目标后再等待片刻即结束, 不等满整个超时
+
+        返回 (匹配设备列表, 是否完整扫描满超时时间). 发现目标后扫描会提前结束,
+        因此只有整段超时内都没有发现目标时第二项才为 True
+        """
         self.logger.info("开始扫描蓝牙设备...")
+        matched: dict[str, dict] = {}
+        found = asyncio.Event()
+        target_name = self.target_name
+        is_esp_device = self.is_esp_device
+
+        def detection_callback(device, _advertisement_data):
+            name, address = device.name, device.address
+            if not name or address in matched:
+                return
+            if target_name in name or is_esp_device(address):
+                matched[address] = {"name": name, "mac": address}
+                if on_found:
+                    on_found(matched[address])
+                found.set()
+
+        complete = False
         try:
-            devices = await BleakScanner.discover()
-            matched = [
-                {"name": d.name, "mac": d.address}
-                for d in devices
-                if d.name
-                and (self.target_name in d.name or self.is_esp_device(d.address))
-            ]
-            return matched
+            loop = asyncio.get_running_loop()
+            async with BleakScanner(detection_callback=detection_callback):
+                deadline = loop.time() + _SCAN_TIMEOUT
+                try:
+                    await asyncio.wait_for(found.wait(), _SCAN_TIMEOUT)
+                except asyncio.TimeoutError:
+                    complete = True
+                else:
+                    await asyncio.sleep(
+                        max(0.0, min(_SCAN_SETTLE, deadline - loop.time()))
+                    )
         except BleakError as e:
-            self.logger.error(f"扫描失败: {str(e)}")
-            return []
+            self.logger.error("扫描失败: %s", e)
+            complete = False
+        return list(matched.values()), complete
 
     async def connect_to_device(self, address):
         try:
-            self.client = BleakClient(address)
-            await self.client.connect()
+            self._target_char = None
+            client = self.client = BleakClient(address)
+            await client.connect()
 
             # 验证服务
-            target_service = self.service_uuid.replace("-", "").lower()
-            target_char = self.char_uuid.replace("-", "").lower()
+            target_service = self._service_uuid_lower
+            target_char = self._char_uuid_lower
+            notification_handler = self.notification_handler
 
-            for service in self.client.services:
-                if service.uuid.replace("-", "").lower() == target_service:
+            for service in client.services:
+                if service.uuid == target_service:
                     for char in service.characteristics:
-                        if char.uuid.replace("-", "").lower() == target_char:
-                            await self.client.start_notify(
-                                char.uuid, self.notification_handler
+                        if char.uuid == target_char:
+                            self._target_char = char
+                            self._supports_wnr = (
+                                "write-without-response" in char.properties
                             )
+                            await client.start_notify(char, notification_handler)
                             return True
             return False
         except BleakError as e:
-            self.logger.error(f"连接失败: {str(e)}")
+            self.logger.error("连接失败: %s", e)
             return False
 
     async def send_command(self, value):
         if not self.client or not self.client.is_connected:
             return False
+        if self._target_char is None:
+            return False
+        if not 0 <= value < len(_BYTE_CACHE):
+            self.logger.error("无效的指令值: %s", value)
+            return False
 
         try:
-            await self.client.write_gatt_char(self.char_uuid, bytes([value]))
-            self.logger.info(f"成功发送指令: {value}")
+            await self.client.write_gatt_char(
+                self._target_char, _BYTE_CACHE[value], response=not self._supports_wnr
+            )
+            self.logger.info("成功发送指令: %s", value)
             return True
         except BleakError as e:
-            self.logger.error(f"发送失败: {str(e)}")
+            self.logger.error("发送失败: %s", e)
             return False
 
     def notification_handler(self, _: BleakGATTCharacteristic, data: bytearray):
-        if len(data) == 3:
-            status = {
-                "light": self._parse_status(data[0], "light"),
-                "fan": self._parse_status(data[1], "fan"),
-                "heater": self._parse_status(data[2], "heater"),
-            }
-            if self.status_callback:
-                self.status_callback(status)
-            return status
-
-    def _parse_status(self, value: int, device: str) -> str:
-        """解析状态数值"""
-        mapping = {
-            "light": {1: "低亮", 2: "关闭", 3: "中亮", 4: "高亮", 5: "呼吸", 6: "流水"},
-            "fan": {7: "低速", 8: "关闭", 9: "中速", 10: "高速"},
-            "heater": {15: "低温", 16: "关闭", 17: "中温", 18: "高温"},
-        }
-        return mapping.get(device, {}).get(value, "未知")
+        if len(data) == 3 and self.status_callback:
+            status = _PACKED_STATUS.get(int.from_bytes(data, "big"))
+            if status is None:
+                status = (
+                    _LIGHT_STATUS[data[0]],
+                    _FAN_STATUS[data[1]],
+                    _HEATER_STATUS[data[2]],
+                )
+            self.status_callback(*status)
 
     def is_esp_device(self, mac: str) -> bool:
-        cleaned = sub(r"[^0-9A-Fa-f]", "", mac).upper()
-        return cleaned[:6] in self.esp_ouis
+        prefix = mac.translate(_MAC_SEPARATORS)[:6]
+        if len(prefix) != 6:
+            return False
+        try:
+            return int(prefix, 16) in self.esp_ouis
+        except ValueError:
+            return False
 
     async def disconnect(self):
         if self.client:
@@ -97,8 +173,10 @@ class BluetoothManager:
                 await self.client.disconnect()
                 await self.client.__aexit__(None, None, None)
                 self.client = None
+                self._target_char = None
+                self._supports_wnr = False
                 return True
             except BleakError as e:
-                self.logger.error(f"断开失败: {str(e)}")
+                self.logger.error("断开失败: %s", e)
                 return False
         return True
\ No newline at end of file
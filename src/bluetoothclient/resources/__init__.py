@@ -0,0 +1,7 @@
+import json
+from importlib.resources import files
+
+# 设备控制面板配置, 进程内只解析一次
+DEVICE_DATA: tuple[dict, ...] = tuple(
+    json.loads((files(__name__) / "device.json").read_text(encoding="utf-8"))
+)
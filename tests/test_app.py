@@ -1,3 +1,83 @@
+from toga.sources import ListSource
+
+from bluetoothclient.app import _SCAN_MISS_LIMIT, _add_device_row, _apply_scan_results
+
+
 def test_first():
     """An initial test for the app."""
     assert 1 + 1 == 2
+
+
+def make_table() -> ListSource:
+    return ListSource(accessors=["name", "mac"])
+
+
+def rows_of(data):
+    return [(row.name, row.mac) for row in data]
+
+
+def test_scan_results_keep_unchanged_rows():
+    data, rows, misses = make_table(), {}, {}
+    _apply_scan_results(
+        data, rows, misses, [{"name": "ESP_A", "mac": "A"}, {"name": "ESP_B", "mac": "B"}]
+    )
+    row_a = rows["A"]
+
+    _apply_scan_results(
+        data, rows, misses, [{"name": "ESP_A", "mac": "A"}, {"name": "ESP_B2", "mac": "B"}]
+    )
+
+    assert rows["A"] is row_a
+    assert rows_of(data) == [("ESP_A", "A"), ("ESP_B2", "B")]
+
+
+def test_scan_results_remove_missing():
+    data, rows, misses = make_table(), {}, {}
+    _apply_scan_results(
+        data, rows, misses, [{"name": "ESP_A", "mac": "A"}, {"name": "ESP_B", "mac": "B"}]
+    )
+    _apply_scan_results(
+        data, rows, misses, [{"name": "ESP_B", "mac": "B"}, {"name": "ESP_C", "mac": "C"}]
+    )
+    assert rows_of(data) == [("ESP_B", "B"), ("ESP_C", "C")]
+    assert set(rows) == {"B", "C"}
+
+
+def test_scanned_device_added_once():
+    data, rows, misses = make_table(), {}, {}
+    device = {"name": "ESP_A", "mac": "A"}
+    _add_device_row(data, rows, device)
+    _add_device_row(data, rows, device)
+    _apply_scan_results(data, rows, misses, [device])
+    assert rows_of(data) == [("ESP_A", "A")]
+
+
+def test_scan_results_keep_missing_after_single_early_stop():
+    data, rows, misses = make_table(), {}, {}
+    a, b = {"name": "ESP_A", "mac": "A"}, {"name": "ESP_B", "mac": "B"}
+    _apply_scan_results(data, rows, misses, [a, b], complete=False)
+    _apply_scan_results(data, rows, misses, [b], complete=False)
+    assert rows_of(data) == [("ESP_A", "A"), ("ESP_B", "B")]
+
+    # 再次被发现后重新计数
+    _apply_scan_results(data, rows, misses, [a, b], complete=False)
+    _apply_scan_results(data, rows, misses, [b], complete=False)
+    assert rows_of(data) == [("ESP_A", "A"), ("ESP_B", "B")]
+
+
+def test_device_disappears_while_another_is_still_found():
+    data, rows, misses = make_table(), {}, {}
+    a, b = {"name": "ESP_A", "mac": "A"}, {"name": "ESP_B", "mac": "B"}
+    _apply_scan_results(data, rows, misses, [a, b], complete=False)
+    for _ in range(_SCAN_MISS_LIMIT):
+        _apply_scan_results(data, rows, misses, [b], complete=False)
+    assert rows_of(data) == [("ESP_B", "B")]
+    assert set(rows) == {"B"}
+    assert misses == {}
+
+
+def test_complete_scan_removes_missing_immediately():
+    data, rows, misses = make_table(), {}, {}
+    _apply_scan_results(data, rows, misses, [{"name": "ESP_A", "mac": "A"}])
+    _apply_scan_results(data, rows, misses, [], complete=True)
+    assert rows_of(data) == []
@@ -0,0 +1,103 @@
+import asyncio
+from types import SimpleNamespace
+
+from bluetoothclient.bluetooth_manager import _PACKED_STATUS, BluetoothManager
+from bluetoothclient.resources.esp_ouis import ouis as esp_ouis
+
+SERVICE_UUID = "000000ff-0000-1000-8000-00805f9b34fb"
+CHAR_UUID = "0000ff01-0000-1000-8000-00805f9b34fb"
+
+
+def make_manager(status_callback=None) -> BluetoothManager:
+    return BluetoothManager(SERVICE_UUID, CHAR_UUID, "ESP", esp_ouis, status_callback)
+
+
+def test_short_uuid_is_expanded():
+    manager = BluetoothManager("00FF", "ff01", "ESP", esp_ouis)
+    assert manager._service_uuid_lower == SERVICE_UUID
+    assert manager._char_uuid_lower == CHAR_UUID
+
+
+def test_invalid_uuid_does_not_raise():
+    manager = BluetoothManager("not-a-uuid", CHAR_UUID, "ESP", esp_ouis)
+    assert manager._service_uuid_lower == "not-a-uuid"
+
+
+def test_notification_unknown_bytes_fall_back_per_byte():
+    received = []
+    manager = make_manager(lambda *status: received.append(status))
+    manager.notification_handler(None, bytearray([0, 10, 255]))
+    manager.notification_handler(None, bytearray([6, 0, 0]))
+    assert received == [("未知", "高速", "未知"), ("流水", "未知", "未知")]
+
+
+def test_notification_ignores_other_lengths():
+    received = []
+    manager = make_manager(lambda *status: received.append(status))
+    manager.notification_handler(None, bytearray([1, 8]))
+    manager.notification_handler(None, bytearray([1, 8, 17, 0]))
+    assert received == []
+
+
+def test_notification_without_callback():
+    make_manager().notification_handler(None, bytearray([1, 8, 17]))
+
+
+class FakeClient:
+    is_connected = True
+
+    def __init__(self):
+        self.writes = []
+
+    async def write_gatt_char(self, char, data, response=None):
+        self.writes.append((char, data, response))
+
+
+def make_connected_manager() -> BluetoothManager:
+    manager = make_manager()
+    manager.client = FakeClient()
+    manager._target_char = SimpleNamespace(uuid=CHAR_UUID)
+    return manager
+
+
+def test_send_command_writes_single_byte():
+    manager = make_connected_manager()
+    assert asyncio.run(manager.send_command(9))
+    assert manager.client.writes == [(manager._target_char, b"\x09", True)]
+
+
+def test_send_command_rejects_out_of_range_values():
+    manager = make_connected_manager()
+    assert not asyncio.run(manager.send_command(-1))
+    assert not asyncio.run(manager.send_command(256))
+    assert manager.client.writes == []
+
+
+def test_is_esp_device():
+    manager = make_manager()
+    assert manager.is_esp_device("24:0A:C4:11:22:33")
+    assert manager.is_esp_device("24:0a:c4:11:22:33")
+    assert manager.is_esp_device("24-0A-C4-11-22-33")
+    assert not manager.is_esp_device("00:11:22:33:44:55")
+
+
+def test_is_esp_device_malformed_address():
+    manager = make_manager()
+    assert not manager.is_esp_device("")
+    assert not manager.is_esp_device("ZZ:ZZ:ZZ:ZZ:ZZ:ZZ")
+    # 不足 6 位的前缀不能被零扩展后误匹配 004B12
+    assert not manager.is_esp_device("4B:12")
+
+
+def test_packed_status_covers_known_combinations():
+    assert len(_PACKED_STATUS) == 6 * 4 * 4
+    assert _PACKED_STATUS[0x010811] == ("低亮", "关闭", "中温")
+    assert _PACKED_STATUS[0x060A12] == ("流水", "高速", "高温")
+
+
+def test_notification_known_packet():
+    received = []
+    make_manager(lambda *status: received.append(status)).notification_handler(
+        None, bytearray([1, 8, 17])
+    )
+    assert received == [("低亮", "关闭", "中温")]